@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+原片分类索引：把导出备份中的原片 markdown 预先解析为结构化 JSON
+
+读取导出文件（📥 导出 生成的 video_portal_backup_*.json）中的：
+- rawFilmsContent: 原片 markdown 文本
+- rawFilmsRatings: 评分（JSON 字符串，key 为 "路径::条目"）
+- rawFilmsSortMode: 当前排序方式
+- rawFilmsSectionOrder: 一级标题顺序（JSON 字符串）
+
+一次性解析为章节和条目，合并评分，并为每种排序方式（none / rating-desc /
+rating-asc）预先计算条目顺序。节点字段与 main.js 中 parseRawFilmsStructure
+的结果一致，页面可直接渲染，切换排序或调整章节顺序时无需重新解析整份文档。
+
+使用方法：
+    python build_raw_films_index.py video_portal_backup_2025-11-09.json
+    python build_raw_films_index.py backup.json -o raw_films_index.json
+"""
+
+import argparse
+import json
+import math
+import re
+import sys
+from pathlib import Path
+
+# 配置
+OUTPUT_FILE = 'raw_films_index.json'  # 输出的索引文件
+SORT_MODES = ['none', 'rating-desc', 'rating-asc']  # 与 getRawFilmsSortMode 一致
+
+HEADER_PATTERN = re.compile(r'^(#{1,6})\s+(.*)$')
+
+
+def parse_json_field(value, default):
+    """导出文件中的 localStorage 值是 JSON 字符串，解析失败时返回默认值"""
+    if value is None or value == 'null':
+        return default
+    if not isinstance(value, str):
+        return value
+    try:
+        return json.loads(value)
+    except ValueError:
+        return default
+
+
+def parse_raw_films_structure(content):
+    """解析原片 markdown（与 main.js 中 parseRawFilmsStructure 相同的规则）"""
+    root = {
+        'level': 0,
+        'title': None,
+        'films': [],
+        'children': [],
+        'path': '',
+        'order': 0
+    }
+
+    stack = [root]
+    order = 0
+    node_order_counter = 0
+
+    if not content:
+        return root
+
+    for line in content.split('\n'):
+        trimmed = line.strip()
+
+        if trimmed == '':
+            continue
+
+        header_match = HEADER_PATTERN.match(trimmed)
+        if header_match:
+            level = min(len(header_match.group(1)), 6)
+            title = header_match.group(2).strip()
+
+            # Adjust stack to current level
+            while len(stack) > level:
+                stack.pop()
+
+            parent = stack[-1] if stack else root
+            node = {
+                'level': level,
+                'title': title,
+                'films': [],
+                'children': [],
+                'order': node_order_counter,
+                'path': f"{parent['path']} > {title}" if parent['path'] else title
+            }
+            node_order_counter += 1
+            parent['children'].append(node)
+            stack.append(node)
+            continue
+
+        # Treat as a film entry
+        current_node = stack[-1] if stack else root
+        current_path = current_node['path'] or 'ROOT'
+        current_node['films'].append({
+            'type': 'film',
+            'text': trimmed,
+            'key': f'{current_path}::{trimmed}',
+            'order': order
+        })
+        order += 1
+
+    return root
+
+
+def get_rating_value(ratings, key):
+    """与 getRawFilmRatingValue 相同：无效或缺失的评分视为 0"""
+    if not ratings or not key:
+        return 0
+    value = ratings.get(key)
+    if value is None or value == '':
+        return 0
+    if isinstance(value, bool):
+        return int(value)
+    try:
+        numeric = float(value)
+    except (TypeError, ValueError):
+        return 0
+    if not math.isfinite(numeric):
+        return 0
+    return int(numeric) if numeric.is_integer() else numeric
+
+
+def film_sort_key(film, sort_mode):
+    """与 sortRawFilmEntries 相同的排序键：未评分排在最后，平局按原始顺序"""
+    if sort_mode == 'rating-desc':
+        return (-(film['rating'] or -0.5), film['order'])
+    if sort_mode == 'rating-asc':
+        return (film['rating'] or 6, film['order'])
+    return (film['order'],)
+
+
+def get_section_key(section):
+    """与 getRawFilmsSectionKey 相同"""
+    if section.get('path'):
+        return section['path']
+    title = section.get('title') or '未命名'
+    return f"{title}#{section.get('order', 0)}"
+
+
+def order_top_level_sections(children, order_list):
+    """与 orderTopLevelSections 相同：已保存的顺序优先，其余按出现顺序"""
+    order_map = {}
+    for index, key in enumerate(order_list if isinstance(order_list, list) else []):
+        if isinstance(key, str):
+            order_map[key] = index
+    fallback = sys.maxsize
+    return sorted(children, key=lambda c: (order_map.get(get_section_key(c), fallback), c.get('order', 0)))
+
+
+def index_node(node, ratings):
+    """合并评分并为每种排序方式预先计算条目顺序（films 数组中的下标）"""
+    for film in node['films']:
+        film['rating'] = get_rating_value(ratings, film['key'])
+
+    node['sortedFilms'] = {
+        mode: sorted(range(len(node['films'])), key=lambda i: film_sort_key(node['films'][i], mode))
+        for mode in SORT_MODES
+    }
+    if node['level'] > 0:
+        node['sectionKey'] = get_section_key(node)
+
+    for child in node['children']:
+        index_node(child, ratings)
+    return node
+
+
+def build_index(export_data):
+    """从导出数据构建原片索引"""
+    data = export_data.get('data', export_data)
+
+    content = data.get('rawFilmsContent')
+    if not isinstance(content, str) or content == 'null':
+        content = ''
+    ratings = parse_json_field(data.get('rawFilmsRatings'), {})
+    if not isinstance(ratings, dict):
+        ratings = {}
+    sort_mode = data.get('rawFilmsSortMode')
+    if sort_mode not in SORT_MODES:
+        sort_mode = 'none'
+    section_order = parse_json_field(data.get('rawFilmsSectionOrder'), [])
+
+    structure = index_node(parse_raw_films_structure(content), ratings)
+    ordered_top_sections = order_top_level_sections(structure['children'], section_order)
+
+    film_count = 0
+    rated_count = 0
+    stack = [structure]
+    while stack:
+        node = stack.pop()
+        film_count += len(node['films'])
+        rated_count += sum(1 for film in node['films'] if film['rating'])
+        stack.extend(node['children'])
+
+    return {
+        'version': '1.0',
+        'exportDate': export_data.get('exportDate'),
+        'sortMode': sort_mode,
+        'sortModes': SORT_MODES,
+        'sectionOrder': [get_section_key(section) for section in ordered_top_sections],
+        'filmCount': film_count,
+        'ratedCount': rated_count,
+        'structure': structure
+    }
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='从导出备份生成原片分类索引')
+    parser.add_argument('backup', help='导出的备份 JSON 文件')
+    parser.add_argument('-o', '--output', default=OUTPUT_FILE, help='输出的索引文件')
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("🎬 原片分类索引工具")
+    print("=" * 50)
+    print()
+
+    backup_path = Path(args.backup)
+    if not backup_path.exists():
+        print(f"❌ 错误: 文件 '{backup_path}' 不存在")
+        sys.exit(1)
+
+    try:
+        with open(backup_path, 'r', encoding='utf-8') as f:
+            export_data = json.load(f)
+    except ValueError as e:
+        print(f"❌ 错误: 无法解析 '{backup_path.name}': {e}")
+        sys.exit(1)
+
+    index = build_index(export_data)
+
+    output_path = Path(args.output)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+
+    print(f"✅ 索引已生成: {output_path}")
+    print(f"📂 一级标题数: {len(index['sectionOrder'])}")
+    print(f"🎞️ 条目数: {index['filmCount']}（已评分 {index['ratedCount']}）")
+    print(f"🔀 当前排序: {index['sortMode']}")
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+发布前完整性检查：校验 data.json 和导出的备份文件
+
+data.json：
+- 项目 ID 唯一（重复 ID 会在 collectAllItems 中互相覆盖；daily-random / favorites
+  不被 collectAllItems 收集，不参与此项检查）
+- 分类 / 子分类 / 子类的 id 唯一（名称经 .replace(' ', '-') 后可能冲突）
+- 项目 URL 非空
+
+备份文件（📥 导出 生成的 JSON，可传入多个）：
+- userAddedItems 的位置键（分类:子分类:子类）在 data.json 中存在
+- 用户添加项的负 ID 不重复
+- 用户添加项 URL 非空
+
+每个文件只遍历一次；发现问题时逐条输出位置并以非零状态退出。
+
+使用方法：
+    python check_data.py
+    python check_data.py data.json "Video Portal Backup Nov 9 2025 (2).json"
+"""
+
+import json
+import sys
+from pathlib import Path
+
+from filter_bitmaps import SKIPPED_CATEGORIES
+
+# 配置
+DATA_FILE = 'data.json'  # 默认检查的数据文件
+
+
+class CatalogueIndex:
+    """data.json 的索引：位置键与项目 ID -> 所在位置"""
+
+    def __init__(self):
+        self.locations = set()
+        self.item_locations = {}
+
+
+def describe_item(location_key, position):
+    return f'{location_key} 第 {position + 1} 项'
+
+
+def check_catalogue(data, source=DATA_FILE):
+    """遍历一次 data.json，返回 (索引, 问题列表)；问题为 (来源, 位置, 说明)"""
+    index = CatalogueIndex()
+    violations = []
+    seen_ids = {'分类': {}, '子分类': {}, '子类': {}}
+
+    categories = data.get('categories') if isinstance(data, dict) else None
+    if not isinstance(categories, list):
+        return index, [(source, '-', '不是 data.json 格式（缺少 categories 列表）')]
+
+    def check_node(level, node, location_key):
+        """检查节点是否为对象且 id 唯一；不是对象时返回 False"""
+        if not isinstance(node, dict):
+            violations.append((source, location_key, f'格式错误，{level}应为对象: {node!r}'))
+            return False
+        node_id = node.get('id')
+        if not node_id:
+            violations.append((source, location_key, f"{level} '{node.get('name', '')}' 缺少 id"))
+            return True
+        if node_id in seen_ids[level]:
+            first = seen_ids[level][node_id]
+            violations.append((source, location_key,
+                               f"{level} id '{node_id}' 重复（'{node.get('name', '')}' 与 {first}）"))
+        else:
+            seen_ids[level][node_id] = f"'{node.get('name', '')}'"
+        return True
+
+    def check_list(value, location_key, label):
+        """items / subcategories / subclasses 应为列表"""
+        if value is None:
+            return []
+        if not isinstance(value, list):
+            violations.append((source, location_key, f'格式错误，{label} 应为列表'))
+            return []
+        return value
+
+    def check_items(items, location_key, unique_ids=True):
+        for position, item in enumerate(check_list(items, location_key, 'items')):
+            where = describe_item(location_key, position)
+            if not isinstance(item, dict):
+                violations.append((source, where, f'格式错误，应为项目对象: {item!r}'))
+                continue
+            item_id = item.get('id')
+            if not isinstance(item_id, int) or isinstance(item_id, bool):
+                violations.append((source, where, f'项目 ID 无效: {item_id!r}'))
+            elif unique_ids:
+                if item_id in index.item_locations:
+                    violations.append((source, where,
+                                       f'项目 ID {item_id} 重复（首次出现于 {index.item_locations[item_id]}）'))
+                else:
+                    index.item_locations[item_id] = where
+            if not str(item.get('url') or '').strip():
+                violations.append((source, where, f'项目 {item_id} 的 URL 为空'))
+
+    for position, category in enumerate(categories):
+        if not check_node('分类', category, f'categories 第 {position + 1} 项'):
+            continue
+        category_key = category.get('id', '')
+        index.locations.add(category_key)
+        # collectAllItems 不收集这些分类的项目，其中的副本不会造成覆盖
+        unique_ids = category_key not in SKIPPED_CATEGORIES
+        check_items(category.get('items'), category_key, unique_ids)
+
+        for sub_position, sub in enumerate(check_list(category.get('subcategories'), category_key, 'subcategories')):
+            if not check_node('子分类', sub, f'{category_key} subcategories 第 {sub_position + 1} 项'):
+                continue
+            sub_key = f"{category_key}:{sub.get('id', '')}"
+            index.locations.add(sub_key)
+            check_items(sub.get('items'), sub_key, unique_ids)
+
+            for subclass_position, subclass in enumerate(check_list(sub.get('subclasses'), sub_key, 'subclasses')):
+                if not check_node('子类', subclass, f'{sub_key} subclasses 第 {subclass_position + 1} 项'):
+                    continue
+                subclass_key = f"{sub_key}:{subclass.get('id', '')}"
+                index.locations.add(subclass_key)
+                check_items(subclass.get('items'), subclass_key, unique_ids)
+
+    return index, violations
+
+
+def check_backup(backup, index, source):
+    """遍历一次备份中的 userAddedItems，对照 data.json 索引返回问题列表"""
+    violations = []
+    data = backup.get('data') if isinstance(backup, dict) else None
+    if not isinstance(data, dict):
+        return [(source, '-', '不是导出的备份文件（缺少 data 字段）')]
+    raw = data.get('userAddedItems')
+    if raw is None or raw == 'null':
+        return violations
+    try:
+        user_added_items = json.loads(raw) if isinstance(raw, str) else raw
+    except ValueError as e:
+        return [(source, 'userAddedItems', f'无法解析: {e}')]
+    if not isinstance(user_added_items, dict):
+        return [(source, 'userAddedItems', '格式错误，应为对象')]
+
+    negative_ids = {}
+    for location_key, items in user_added_items.items():
+        if location_key not in index.locations:
+            violations.append((source, location_key, '位置键在 data.json 中不存在'))
+
+        if not isinstance(items, list):
+            violations.append((source, location_key, '格式错误，应为项目列表'))
+            continue
+
+        for position, item in enumerate(items):
+            where = describe_item(location_key, position)
+            if not isinstance(item, dict):
+                violations.append((source, where, f'格式错误，应为项目对象: {item!r}'))
+                continue
+            item_id = item.get('id')
+            if not isinstance(item_id, int) or isinstance(item_id, bool):
+                violations.append((source, where, f'项目 ID 无效: {item_id!r}'))
+                continue
+            if item_id < 0:
+                if item_id in negative_ids:
+                    violations.append((source, where,
+                                       f'用户添加项 ID {item_id} 重复（首次出现于 {negative_ids[item_id]}）'))
+                else:
+                    negative_ids[item_id] = where
+            if not str(item.get('url') or '').strip():
+                violations.append((source, where, f'项目 {item_id} 的 URL 为空'))
+
+    return violations
+
+
+def check_files(data_file, backup_files=()):
+    """检查 data.json 和若干备份文件，返回问题列表"""
+    with open(data_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    index, violations = check_catalogue(data, Path(data_file).name)
+
+    for backup_file in backup_files:
+        with open(backup_file, 'r', encoding='utf-8') as f:
+            backup = json.load(f)
+        violations.extend(check_backup(backup, index, Path(backup_file).name))
+
+    return violations
+
+
+def print_violations(violations):
+    """逐条输出问题"""
+    for source, location, message in violations:
+        print(f"   ❌ [{source}] {location}: {message}")
+
+
+def main():
+    """主函数"""
+    args = sys.argv[1:]
+    data_file = args[0] if args else DATA_FILE
+    backup_files = args[1:]
+
+    print("=" * 50)
+    print("🔍 数据完整性检查")
+    print("=" * 50)
+    print()
+
+    try:
+        violations = check_files(data_file, backup_files)
+    except (OSError, ValueError) as e:
+        print(f"❌ 错误: {e}")
+        sys.exit(1)
+
+    if violations:
+        print(f"❌ 发现 {len(violations)} 个问题:")
+        print_violations(violations)
+        print()
+        sys.exit(1)
+
+    print(f"✅ 检查通过: {data_file}" + (f" + {len(backup_files)} 个备份文件" if backup_files else ''))
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+筛选索引：为每日随机 / 收藏筛选预先计算每个位置的项目位图
+
+构建时按 collectAllItems 的遍历顺序给每个项目分配连续序号（分类直属项目、
+子分类直属项目、子类项目依次排列），因此每个位置的直属项目和整棵子树都是
+连续区间，以游程（[起始, 结束) 区间列表）形式写入 filter_index.json。
+
+筛选对象（categories / subcategories / subclasses / excludedSubcategories /
+excludedSubclasses）被转换为这些区间位图上的并集和差集运算，代价与筛选中
+选中的节点数成正比，而不是项目数。结果与 main.js 中 collectAllItems 对
+data.json 项目的筛选结果一致（userAddedItems 和删除项仍由页面处理）。
+
+使用方法：
+    python filter_bitmaps.py                       # 从 data.json 生成 filter_index.json
+    python filter_bitmaps.py --verify backup.json  # 用备份中的筛选和随机筛选对照 main.js 验证结果（需要 node）
+"""
+
+import argparse
+import json
+import random
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+# 配置
+DATA_FILE = 'data.json'  # 输入的数据文件
+FILTER_INDEX_FILE = 'filter_index.json'  # 输出的筛选索引
+MAIN_JS_FILE = Path(__file__).resolve().parent / 'main.js'  # --verify 时对照的页面逻辑
+SKIPPED_CATEGORIES = ('daily-random', 'favorites')  # collectAllItems 不收集的分类
+VERIFY_RANDOM_FILTERS = 500  # --verify 时额外生成的随机筛选数量
+
+
+def build_filter_index(data):
+    """遍历一次 data.json，返回筛选索引（序号 -> 项目 ID，以及每个位置的区间）"""
+    ids = []
+    nodes = {}
+
+    def add_node(key, level, parent, start, items):
+        for item in items or []:
+            ids.append(item['id'])
+        node = nodes.setdefault(key, {'level': level, 'parent': parent, 'items': [], 'tree': []})
+        if items:
+            node['items'].append([start, start + len(items)])
+        return node
+
+    def close_tree(node, start):
+        if len(ids) > start:
+            node['tree'].append([start, len(ids)])
+
+    for category in data.get('categories', []):
+        if category['id'] in SKIPPED_CATEGORIES:
+            continue
+        category_key = category['id']
+        category_start = len(ids)
+        category_node = add_node(category_key, 'category', None, category_start, category.get('items'))
+
+        for sub in category.get('subcategories') or []:
+            sub_key = f"{category_key}:{sub['id']}"
+            sub_start = len(ids)
+            sub_node = add_node(sub_key, 'subcategory', category_key, sub_start, sub.get('items'))
+
+            for subclass in sub.get('subclasses') or []:
+                subclass_key = f"{sub_key}:{subclass['id']}"
+                subclass_start = len(ids)
+                subclass_node = add_node(subclass_key, 'subclass', sub_key, subclass_start, subclass.get('items'))
+                close_tree(subclass_node, subclass_start)
+
+            close_tree(sub_node, sub_start)
+        close_tree(category_node, category_start)
+
+    return {
+        'version': '1.0',
+        'itemCount': len(ids),
+        'ids': ids,
+        'nodes': nodes
+    }
+
+
+def runs_to_bitmap(runs):
+    """把 [起始, 结束) 区间列表转换为整数位图"""
+    bitmap = 0
+    for start, end in runs:
+        bitmap |= ((1 << (end - start)) - 1) << start
+    return bitmap
+
+
+class FilterIndex:
+    """加载后的筛选索引：区间位图与筛选求值"""
+
+    def __init__(self, index):
+        self.ids = index['ids']
+        self.nodes = index['nodes']
+        self.items = {key: runs_to_bitmap(node['items']) for key, node in self.nodes.items()}
+        self.tree = {key: runs_to_bitmap(node['tree']) for key, node in self.nodes.items()}
+        self.all = (1 << len(self.ids)) - 1
+        self.category_items = 0
+        for key, node in self.nodes.items():
+            if node['level'] == 'category':
+                self.category_items |= self.items[key]
+
+    def parent(self, key):
+        node = self.nodes.get(key)
+        return node['parent'] if node else None
+
+    def evaluate(self, filter):
+        """返回筛选选中的项目位图（与 collectAllItems 对 data.json 项目的规则一致）"""
+        if not filter:
+            return self.all
+
+        excluded_subcategories = set(filter.get('excludedSubcategories') or [])
+        excluded_subclasses = set(filter.get('excludedSubclasses') or [])
+        subcategories = set(filter.get('subcategories') or [])
+
+        result = 0
+        if filter.get('categories'):
+            categories = set(filter['categories'])
+            # Included categories: whole subtree minus excluded subcategories/subclasses under them
+            for key in categories:
+                result |= self.tree.get(key, 0)
+            for key in excluded_subcategories:
+                if self.parent(key) in categories:
+                    result &= ~self.tree.get(key, 0)
+            for key in excluded_subclasses:
+                if self.parent(self.parent(key)) in categories:
+                    result &= ~self.items.get(key, 0)
+            # Subcategories picked under other categories include all of their subclasses
+            for key in subcategories - excluded_subcategories:
+                if self.parent(key) not in categories:
+                    result |= self.tree.get(key, 0)
+        else:
+            # categories missing: every category keeps its own items, subcategories must be picked
+            # categories == []: no category is included, only picked subcategories/subclasses
+            if filter.get('categories') is None:
+                result |= self.category_items
+            categories = set()
+            for key in subcategories - excluded_subcategories:
+                result |= self.tree.get(key, 0)
+            if filter.get('categories') is None:
+                for key in excluded_subclasses:
+                    if self.parent(key) in subcategories:
+                        result &= ~self.items.get(key, 0)
+
+        # Individually picked subclasses whose parents are not already included
+        for key in set(filter.get('subclasses') or []) - excluded_subclasses:
+            sub_key = self.parent(key)
+            if sub_key is None or sub_key in excluded_subcategories:
+                continue
+            if sub_key in subcategories or self.parent(sub_key) in categories:
+                continue
+            result |= self.items.get(key, 0)
+
+        return result
+
+    def select_ids(self, filter):
+        """返回筛选选中的项目 ID 集合"""
+        bits = bin(self.evaluate(filter))[:1:-1]
+        return {self.ids[ordinal] for ordinal, bit in enumerate(bits) if bit == '1'}
+
+
+# Node harness for --verify: loads main.js into a sandbox with an empty localStorage
+# and returns the IDs collectAllItems selects for each filter
+MAIN_JS_HARNESS = r"""
+const fs = require('fs');
+const vm = require('vm');
+const store = {};
+const context = vm.createContext({
+    console,
+    localStorage: {
+        getItem: key => (key in store ? store[key] : null),
+        setItem: (key, value) => { store[key] = String(value); },
+        removeItem: key => { delete store[key]; }
+    }
+});
+vm.runInContext(fs.readFileSync(process.argv[1], 'utf8'), context, { filename: 'main.js' });
+const input = JSON.parse(fs.readFileSync(0, 'utf8'));
+context.__data = input.data;
+const results = input.filters.map(filter => {
+    context.__filter = filter;
+    const items = vm.runInContext('collectAllItems(__data, __filter)', context);
+    return [...new Set(items.map(item => item.id))];
+});
+process.stdout.write(JSON.stringify(results));
+"""
+
+
+def collect_item_ids_with_main_js(data, filters, main_js=MAIN_JS_FILE):
+    """用 node 运行 main.js 中的 collectAllItems，返回每个筛选选中的项目 ID 集合"""
+    if shutil.which('node') is None:
+        raise RuntimeError('--verify 需要 node 来运行 main.js')
+    completed = subprocess.run(
+        ['node', '-e', MAIN_JS_HARNESS, str(main_js)],
+        input=json.dumps({'data': data, 'filters': filters}, ensure_ascii=False),
+        capture_output=True, text=True, encoding='utf-8'
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f'运行 main.js 失败: {completed.stderr.strip()}')
+    return [set(ids) for ids in json.loads(completed.stdout)]
+
+
+def parse_filter(value):
+    """备份中的筛选是 JSON 字符串"""
+    if value is None or value == 'null':
+        return None
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def random_filter(index, rng):
+    """从索引中的节点随机组合一个筛选对象"""
+    keys = {'category': [], 'subcategory': [], 'subclass': []}
+    for key, node in index.nodes.items():
+        keys[node['level']].append(key)
+
+    def pick(level):
+        pool = keys[level]
+        return rng.sample(pool, rng.randint(0, min(len(pool), 4)))
+
+    filter = {
+        'subcategories': pick('subcategory'),
+        'subclasses': pick('subclass'),
+        'excludedSubcategories': pick('subcategory'),
+        'excludedSubclasses': pick('subclass'),
+    }
+    choice = rng.random()
+    if choice < 0.6:
+        filter['categories'] = pick('category')
+    elif choice < 0.8:
+        filter['categories'] = []
+    return filter
+
+
+def verify(data, filters, main_js=MAIN_JS_FILE):
+    """比较位图求值与 main.js 中 collectAllItems 的结果，返回不一致的筛选列表"""
+    index = FilterIndex(build_filter_index(data))
+    expected = collect_item_ids_with_main_js(data, filters, main_js)
+    return [f for f, ids in zip(filters, expected) if index.select_ids(f) != ids]
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='生成每日随机 / 收藏筛选的位置位图索引')
+    parser.add_argument('data', nargs='?', default=DATA_FILE, help='data.json 路径')
+    parser.add_argument('-o', '--output', default=FILTER_INDEX_FILE, help='输出的筛选索引')
+    parser.add_argument('--verify', nargs='*', metavar='BACKUP',
+                        help='不生成文件，用备份中的筛选和随机筛选验证结果与 main.js 一致（需要 node）')
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("🧮 筛选位图索引")
+    print("=" * 50)
+    print()
+
+    with open(args.data, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    if args.verify is not None:
+        filters = [None, {}]
+        for backup_file in args.verify:
+            with open(backup_file, 'r', encoding='utf-8') as f:
+                backup = json.load(f).get('data', {})
+            for field in ('dailyRandomFilter', 'favoritesFilter'):
+                filters.append(parse_filter(backup.get(field)))
+        rng = random.Random(0)
+        index = FilterIndex(build_filter_index(data))
+        filters.extend(random_filter(index, rng) for _ in range(VERIFY_RANDOM_FILTERS))
+
+        try:
+            mismatches = verify(data, filters)
+        except RuntimeError as e:
+            print(f"❌ 错误: {e}")
+            sys.exit(1)
+        if mismatches:
+            print(f"❌ {len(mismatches)} / {len(filters)} 个筛选结果不一致:")
+            for f in mismatches[:10]:
+                print(f"   {json.dumps(f, ensure_ascii=False)}")
+            sys.exit(1)
+        print(f"✅ {len(filters)} 个筛选的结果与 main.js 中 collectAllItems 一致")
+        print()
+        return
+
+    index = build_filter_index(data)
+    with open(Path(args.output), 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+
+    print(f"✅ 筛选索引已生成: {args.output}")
+    print(f"📊 项目数: {index['itemCount']}  位置数: {len(index['nodes'])}")
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+并发压测脚本：模拟大量浏览器同时访问门户网站
+
+在本地启动一个静态服务器（与 README 中的 `python -m http.server` 使用相同的
+文件处理，但改用 HTTP/1.1 keep-alive 并加大连接队列，使延迟反映目录规模而不是
+连接被丢弃后的重连），用 asyncio + 连接池模拟 N 个并发浏览器的真实会话：
+1. 首次加载：index.html，然后并行获取 style.css / main.js / data.json
+2. 切换分类：纯前端操作（main.js 中 data.json 已缓存），只产生思考时间
+3. 刷新每日随机：重新加载页面，带 If-Modified-Since 条件请求（命中返回 304）
+
+按不同的目录规模生成合成 data.json，输出吞吐量和 p50/p95/p99 延迟。
+
+使用方法：
+    python load_test.py
+    python load_test.py --clients 200 --sizes 1000,10000,100000
+    python load_test.py --url http://localhost:8000   # 压测已运行的服务器
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import shutil
+import tempfile
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+# 配置
+STATIC_FILES = ['index.html', 'style.css', 'main.js']  # 页面静态资源
+DATA_FILE = 'data.json'  # 与 main.js 中的 DATA_FILE 一致
+DEFAULT_CLIENTS = 100  # 并发浏览器数量
+DEFAULT_SESSIONS = 3  # 每个浏览器的会话次数
+DEFAULT_SIZES = [500, 5000, 50000]  # 合成目录的项目数量
+MAX_CONNECTIONS_PER_CLIENT = 6  # 浏览器对同一主机的连接上限
+THINK_TIME = (0.05, 0.3)  # 用户操作之间的停顿（秒）
+REQUEST_TIMEOUT = 30  # 单个请求超时（秒）
+SERVER_QUEUE_SIZE = 1024  # 测试服务器的 listen 队列（默认 5 会在并发连接时丢弃连接）
+
+
+def build_synthetic_data(item_count, items_per_location=20):
+    """生成与 update_data.py 输出结构相同的合成 data.json"""
+    categories = [{
+        'id': 'daily-random',
+        'name': '每日随机',
+        'icon': '🌟',
+        'isRandom': True,
+        'maxItems': 20,
+        'items': []
+    }]
+
+    item_id = 1
+
+    def make_items(count):
+        nonlocal item_id
+        items = []
+        for _ in range(count):
+            text = f'合成项目 {item_id}'
+            items.append({
+                'id': item_id,
+                'name': text,
+                'url': f'https://www.youtube.com/@synthetic{item_id}/videos',
+                'text': text
+            })
+            item_id += 1
+        return items
+
+    cat_index = 0
+    while item_id <= item_count:
+        cat_id = f'category-{cat_index}'
+        category = {
+            'id': cat_id,
+            'name': f'分类 {cat_index}',
+            'icon': '📁',
+            'maxItems': 50,
+            'items': make_items(min(items_per_location, item_count - item_id + 1)),
+            'subcategories': []
+        }
+        for sub_index in range(4):
+            if item_id > item_count:
+                break
+            sub_id = f'{cat_id}-sub-{sub_index}'
+            subcategory = {
+                'id': sub_id,
+                'name': f'子分类 {sub_index}',
+                'icon': '📂',
+                'maxItems': 50,
+                'items': make_items(min(items_per_location, item_count - item_id + 1)),
+                'subclasses': []
+            }
+            for subclass_index in range(3):
+                if item_id > item_count:
+                    break
+                subcategory['subclasses'].append({
+                    'id': f'{sub_id}-subclass-{subclass_index}',
+                    'name': f'小类 {subclass_index}',
+                    'icon': '📄',
+                    'maxItems': 50,
+                    'items': make_items(min(items_per_location, item_count - item_id + 1))
+                })
+            category['subcategories'].append(subcategory)
+        categories.append(category)
+        cat_index += 1
+
+    categories.append({
+        'id': 'raw-films',
+        'name': '原片分类',
+        'icon': '🎬',
+        'isTextOnly': True,
+        'maxItems': 50,
+        'items': []
+    })
+    categories.append({
+        'id': 'collection',
+        'name': '我的合集',
+        'icon': '📚',
+        'maxItems': 50,
+        'items': []
+    })
+    return {'categories': categories}
+
+
+def prepare_site(folder, item_count):
+    """把静态资源复制到临时目录，并写入合成 data.json"""
+    folder = Path(folder)
+    source = Path(__file__).resolve().parent
+    for name in STATIC_FILES:
+        shutil.copy(source / name, folder / name)
+    data_path = folder / DATA_FILE
+    with open(data_path, 'w', encoding='utf-8') as f:
+        json.dump(build_synthetic_data(item_count), f, ensure_ascii=False, indent=2)
+    return data_path.stat().st_size
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """与 http.server 相同的文件处理，但使用 HTTP/1.1 keep-alive 且不打印访问日志"""
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LoadTestServer(ThreadingHTTPServer):
+    """加大 listen 队列的 ThreadingHTTPServer"""
+    request_queue_size = SERVER_QUEUE_SIZE
+    daemon_threads = True
+
+
+def start_server(folder):
+    """在后台线程启动本地静态服务器，返回 (server, base_url)"""
+    handler = partial(QuietHandler, directory=str(folder))
+    server = LoadTestServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    return server, f'http://{host}:{port}'
+
+
+class ConnectionPool:
+    """单个浏览器的 keep-alive 连接池（最多 max_size 个连接）"""
+
+    def __init__(self, host, port, max_size=MAX_CONNECTIONS_PER_CLIENT):
+        self.host = host
+        self.port = port
+        self.idle = []
+        self.slots = asyncio.Semaphore(max_size)
+
+    async def acquire(self, fresh=False):
+        """返回 (连接, 是否为复用的空闲连接)；fresh=True 时总是新建连接"""
+        await self.slots.acquire()
+        if self.idle and not fresh:
+            return self.idle.pop(), True
+        try:
+            return await asyncio.open_connection(self.host, self.port), False
+        except Exception:
+            self.slots.release()
+            raise
+
+    def release(self, conn, reusable=True):
+        if reusable:
+            self.idle.append(conn)
+        else:
+            conn[1].close()
+        self.slots.release()
+
+    async def close(self):
+        for _, writer in self.idle:
+            writer.close()
+        self.idle = []
+
+
+class EmptyResponseError(ConnectionError):
+    """收到状态行之前连接已关闭（复用的连接可能已被服务器关闭）"""
+
+
+async def read_chunked_body(reader):
+    """读取 Transfer-Encoding: chunked 的响应体"""
+    body = b''
+    while True:
+        size_line = await reader.readline()
+        if not size_line:
+            raise ConnectionError('chunked 响应体不完整')
+        size = int(size_line.split(b';')[0].strip(), 16)
+        if size == 0:
+            # Skip trailers up to the blank line
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+            return body
+        body += await reader.readexactly(size)
+        await reader.readexactly(2)
+
+
+async def read_response(reader):
+    """读取一个 HTTP 响应，返回 (version, status, headers, body, reusable)
+
+    支持 Content-Length、chunked 和以关闭连接结束的响应体；
+    HTTP/1.0 响应只有带 Connection: keep-alive 时连接才可复用。
+    """
+    try:
+        status_line = await reader.readline()
+    except ConnectionError as e:
+        raise EmptyResponseError(str(e)) from e
+    if not status_line:
+        raise EmptyResponseError('连接被服务器关闭')
+    version, status = status_line.split()[:2]
+    version = version.decode('latin-1')
+    status = int(status)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        key, _, value = line.decode('latin-1').partition(':')
+        headers[key.strip().lower()] = value.strip()
+
+    connection = headers.get('connection', '').lower()
+    if version == 'HTTP/1.0':
+        reusable = connection == 'keep-alive'
+    else:
+        reusable = connection != 'close'
+
+    if status < 200 or status in (204, 304):
+        body = b''
+    elif 'chunked' in headers.get('transfer-encoding', '').lower():
+        body = await read_chunked_body(reader)
+    elif 'content-length' in headers:
+        body = await reader.readexactly(int(headers['content-length']))
+    else:
+        # Close-delimited body
+        body = await reader.read()
+        reusable = False
+    return version, status, headers, body, reusable
+
+
+async def fetch(pool, path, stats, extra_headers=None):
+    """通过连接池发送 GET 请求并记录延迟
+
+    与浏览器相同：复用的空闲连接在收到响应前被关闭时，换新连接重试一次。
+    """
+    lines = [f'GET {path} HTTP/1.1', f'Host: {pool.host}:{pool.port}', 'Connection: keep-alive']
+    for key, value in (extra_headers or {}).items():
+        lines.append(f'{key}: {value}')
+    request = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+    start = time.perf_counter()
+    fresh = False
+    while True:
+        try:
+            conn, reused = await pool.acquire(fresh)
+        except OSError:
+            stats.record_error()
+            return None, {}
+        reader, writer = conn
+        try:
+            try:
+                writer.write(request)
+                await writer.drain()
+            except ConnectionError as e:
+                raise EmptyResponseError(str(e)) from e
+            _, status, headers, body, reusable = await asyncio.wait_for(read_response(reader), REQUEST_TIMEOUT)
+        except EmptyResponseError:
+            pool.release(conn, reusable=False)
+            if reused and not fresh:
+                fresh = True
+                continue
+            stats.record_error()
+            return None, {}
+        except Exception:
+            pool.release(conn, reusable=False)
+            stats.record_error()
+            return None, {}
+        break
+
+    pool.release(conn, reusable)
+    stats.record(status, time.perf_counter() - start, len(body))
+    return status, headers
+
+
+class Stats:
+    """汇总所有请求的延迟、状态码与传输字节数"""
+
+    def __init__(self):
+        self.latencies = []
+        self.status_counts = {}
+        self.bytes_received = 0
+        self.errors = 0
+
+    def record(self, status, latency, size):
+        self.latencies.append(latency)
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        self.bytes_received += size
+
+    def record_error(self):
+        self.errors += 1
+
+    def percentile(self, p):
+        """最近秩法计算百分位延迟（毫秒）"""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        index = max(0, math.ceil(p / 100 * len(ordered)) - 1)
+        return ordered[index] * 1000
+
+
+async def load_page(pool, stats, cache):
+    """加载页面：先取 index.html，再并行取其余资源；命中缓存时发送条件请求"""
+    async def get(path):
+        headers = {}
+        if path in cache:
+            headers['If-Modified-Since'] = cache[path]
+        status, response_headers = await fetch(pool, path, stats, headers)
+        if status == 200 and 'last-modified' in response_headers:
+            cache[path] = response_headers['last-modified']
+
+    await get('/index.html')
+    await asyncio.gather(*(get(f'/{name}') for name in STATIC_FILES[1:] + [DATA_FILE]))
+
+
+async def simulate_browser(host, port, sessions, stats, rng):
+    """一个浏览器：若干次会话，每次会话首次加载后随机切换分类或刷新每日随机"""
+    pool = ConnectionPool(host, port)
+    cache = {}  # path -> Last-Modified，重复访问时使用
+    try:
+        for _ in range(sessions):
+            await load_page(pool, stats, cache)
+            for _ in range(rng.randint(2, 6)):
+                await asyncio.sleep(rng.uniform(*THINK_TIME))
+                if rng.random() < 0.3:
+                    # 刷新每日随机 = 重新加载页面
+                    await load_page(pool, stats, cache)
+                # 否则为切换分类：数据已缓存在页面内，不产生请求
+    finally:
+        await pool.close()
+
+
+async def run_load(base_url, clients, sessions, seed):
+    """并发运行所有浏览器，返回 (stats, 总耗时)"""
+    parts = urlsplit(base_url)
+    host, port = parts.hostname, parts.port or 80
+    stats = Stats()
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        simulate_browser(host, port, sessions, stats, random.Random(rng.random()))
+        for _ in range(clients)
+    ))
+    return stats, time.perf_counter() - start
+
+
+def print_report(label, stats, elapsed):
+    """打印一次压测的结果"""
+    total = len(stats.latencies)
+    throughput = total / elapsed if elapsed > 0 else 0
+    statuses = ', '.join(f'{code}: {count}' for code, count in sorted(stats.status_counts.items()))
+    print(f"📊 {label}")
+    print(f"   请求数: {total}  错误: {stats.errors}  状态码: {statuses or '-'}")
+    print(f"   吞吐量: {throughput:.1f} req/s  传输: {stats.bytes_received / 1024 / 1024:.1f} MB  耗时: {elapsed:.2f}s")
+    print(f"   延迟: p50 {stats.percentile(50):.1f}ms  p95 {stats.percentile(95):.1f}ms  p99 {stats.percentile(99):.1f}ms")
+    print()
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='门户网站并发压测')
+    parser.add_argument('--clients', type=int, default=DEFAULT_CLIENTS, help='并发浏览器数量')
+    parser.add_argument('--sessions', type=int, default=DEFAULT_SESSIONS, help='每个浏览器的会话次数')
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help='合成 data.json 的项目数量（逗号分隔）')
+    parser.add_argument('--url', help='压测已运行的服务器（不生成合成数据）')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("🚀 门户网站并发压测")
+    print("=" * 50)
+    print(f"👥 并发浏览器: {args.clients}  每个浏览器会话数: {args.sessions}")
+    print()
+
+    if args.url:
+        stats, elapsed = asyncio.run(run_load(args.url, args.clients, args.sessions, args.seed))
+        print_report(args.url, stats, elapsed)
+        return
+
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as folder:
+            data_size = prepare_site(folder, size)
+            server, base_url = start_server(folder)
+            try:
+                stats, elapsed = asyncio.run(run_load(base_url, args.clients, args.sessions, args.seed))
+            finally:
+                server.shutdown()
+                server.server_close()
+        print_report(f"目录规模 {size} 项（data.json {data_size / 1024:.0f} KB）", stats, elapsed)
+
+
+if __name__ == '__main__':
+    main()
@@ -12,145 +12,154 @@ import csv
 import json
 import os
 import glob
+import sys
 from pathlib import Path
 
+from check_data import check_catalogue, print_violations
+from filter_bitmaps import FILTER_INDEX_FILE, build_filter_index
+
 # 配置
 CSV_INPUT_FOLDER = 'csv_input'  # CSV 文件所在文件夹
 OUTPUT_FILE = 'data.json'  # 输出的 JSON 文件
 
-# Emoji mapping for categories, subcategories, and subclasses
-EMOJI_MAP = {
-    # Categories
-    '影视': '🎬',
-    '游戏实况': '🎮',
-    '游戏综合': '🎯',
-    '新游试玩': '🆕',
-    '有益': '📚',
-    '悠闲轻松': '😌',
-    'hehe': '😏',
-    'scp/怪谈': '👻',
-    '专注音乐/视频当背景版': '🎵',
-    '体育赛事': '⚽',
-    '信息源': '📰',
-    '漫画/小说': '📖',
-    '音乐区': '🎤',
-    
-    # Subcategories (classes)
-    '完整': '🎯',
-    '画质': '✨',
-    '杂': '🔀',
-    '格斗': '👊',
-    '第三人称射击': '🔫',
-    '完整合集': '📦',
-    '单独合集': '📦',
-    '恐怖猎奇': '😱',
-    '测评': '📊',
-    '电子榨菜': '🍜',
-    '抽象': '🎨',
-    '欢乐': '😄',
-    '微恐': '👻',
-    '推理': '🔍',
-    '文艺': '🎭',
-    '时政点评': '🗳️',
-    '访谈': '🎤',
-    '科普': '🔬',
-    '工科': '⚙️',
-    '理科': '🧮',
-    '文科': '📜',
-    '英语': '🇬🇧',
-    'AI': '🤖',
-    '摄影': '📷',
-    '厨艺': '👨‍🍳',
-    '国标': '💃',
-    '权术/勾心斗角': '🎭',
-    '社会学': '👥',
-    '心理学': '🧠',
-    '历史': '📜',
-    '哲学': '🤔',
-    '码农': '💻',
-    '学习观': '📖',
-    '数学': '🔢',
-    '机械': '🔧',
-    '教学': '👨‍🏫',
-    'mod': '🔧',
-    '整活': '🎪',
-    '僵毁': '🧟',
-    'MC': '⛏️',
-    '以撒': '💀',
-    '泰拉瑞亚': '🗺️',
-    '肉鸽': '🎲',
-    '电影': '🎞️',
-    '短视频': '📹',
-    '定格动画': '🎭',
-    '美漫': '🦸',
-    'san': '😵',
-    '自制': '🎨',
-    '战锤': '⚔️',
-    '解说': '🗣️',
-    '原片+解析': '🎬',
-    '原片': '🎬',
-    '长剧情游戏': '🎮',
-    '感人': '😢',
-    '动态': '📱',
-    '互动小说': '📱',
-    '美女': '💃',
-    '攻略': '🗺️',
-    '技巧': '💡',
-    '综艺': '📺',
-    '米米米': '🎵',
-    '鬼畜': '😈',
-    '足球': '⚽',
-    '射击': '🎯',
-    '挂机': '⏸️',
-    '渲染': '🎨',
-    '训练': '🏋️',
-    '评测': '📊',
-    '吃播': '🍽️',
-    '韩语': '🇰🇷',
-    '火影手游': '🥷',
-    '单口': '🎤',
-    
-    # Subclasses
-    'mk': '🥊',
-    '3a大作': '🎮',
-    '生存类': '🏕️',
-    '机器鸡': '🐔',
-    'mc': '⛏️',
-    '声控': '🎙️',
-    '教学': '👨‍🏫',
-    '课程': '📚',
-    '乐高大赛': '🧱',
-    '对战类': '⚔️',
-    '电子斗蛐蛐': '🦗',
-    '躲猫猫': '🙈',
-    '火影手游/究极风暴': '🥷',
-    '战锤 / 其他游戏动画': '⚔️',
+EMOJI_MAP_FILE = 'emoji_map.json'  # 分类/子分类/子类名称 -> emoji 的映射
+
+# Default emojis based on level
+DEFAULT_EMOJIS = {
+    'category': '📁',
+    'subcategory': '📂',
+    'subclass': '📄',
 }
 
+def load_emoji_map(path=EMOJI_MAP_FILE):
+    """Load the name -> emoji mapping from the JSON config file"""
+    map_path = Path(path)
+    if not map_path.is_absolute():
+        map_path = Path(__file__).resolve().parent / map_path
+    
+    with open(map_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+class EmojiMatcher:
+    """Precompiled matcher for EMOJI_MAP keys
+    
+    Partial matches are resolved with two structures built once:
+    - an Aho-Corasick automaton to find every key contained in a name
+    - a substring index to find every key that contains a name
+    
+    When several keys match, the longest overlap wins, then the shorter key,
+    then the key listed first in the config, so results no longer depend on
+    scanning order. Results are memoized per (name, level).
+    """
+    
+    def __init__(self, emoji_map):
+        self.emoji_map = dict(emoji_map)
+        self.rank = {key: index for index, key in enumerate(self.emoji_map)}
+        self.cache = {}
+        self._build_automaton()
+        self._build_substring_index()
+    
+    def _build_automaton(self):
+        # Trie over the keys: goto[state] maps char -> state, output[state] is the key ending there
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [None]
+        for key in self.emoji_map:
+            if not key:
+                continue
+            state = 0
+            for char in key:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(None)
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state] = key
+        
+        # Breadth-first pass to fill failure links
+        queue = list(self.goto[0].values())
+        # dict_link[state] is the nearest state on the failure chain that ends a key
+        self.dict_link = [0] * len(self.goto)
+        for state in queue:
+            for char, next_state in self.goto[state].items():
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                queue.append(next_state)
+        for state in queue:
+            link = self.fail[state]
+            self.dict_link[state] = link if self.output[link] else self.dict_link[link]
+    
+    def _build_substring_index(self):
+        # substring -> best key containing it (name in key)
+        self.substring_index = {}
+        for key in self.emoji_map:
+            for i in range(len(key)):
+                for j in range(i + 1, len(key) + 1):
+                    part = key[i:j]
+                    best = self.substring_index.get(part)
+                    if best is None or self._sort_key(key, len(part)) < self._sort_key(best, len(part)):
+                        self.substring_index[part] = key
+    
+    def _sort_key(self, key, overlap):
+        return (-overlap, len(key), self.rank[key])
+    
+    def keys_in(self, name):
+        """Yield every key that occurs in name"""
+        state = 0
+        for char in name:
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            match = state if self.output[state] else self.dict_link[state]
+            while match:
+                yield self.output[match]
+                match = self.dict_link[match]
+    
+    def partial_match(self, name):
+        """Return the best key matching name in either direction, or None"""
+        candidates = [(self._sort_key(key, len(key)), key) for key in self.keys_in(name)]
+        container = self.substring_index.get(name)
+        if container is not None:
+            candidates.append((self._sort_key(container, len(name)), container))
+        if not candidates:
+            return None
+        return min(candidates)[1]
+    
+    def lookup(self, name, level='category'):
+        """Get emoji for a category, subcategory, or subclass name"""
+        cache_key = (name, level)
+        if cache_key in self.cache:
+            return self.cache[cache_key]
+        
+        # Try exact match first
+        emoji = self.emoji_map.get(name)
+        
+        # Try partial matches for subcategories/subclasses
+        if emoji is None and level in ['subcategory', 'subclass']:
+            key = self.partial_match(name)
+            if key is not None:
+                emoji = self.emoji_map[key]
+        
+        if emoji is None:
+            emoji = DEFAULT_EMOJIS.get(level, '📁')
+        
+        self.cache[cache_key] = emoji
+        return emoji
+
+# Emoji mapping for categories, subcategories, and subclasses
+EMOJI_MAP = load_emoji_map()
+EMOJI_MATCHER = EmojiMatcher(EMOJI_MAP)
+
 def get_emoji_for_name(name, level='category'):
     """Get emoji for a category, subcategory, or subclass name"""
     if not name:
         return None
     
-    # Try exact match first
-    if name in EMOJI_MAP:
-        return EMOJI_MAP[name]
-    
-    # Try partial matches for subcategories/subclasses
-    if level in ['subcategory', 'subclass']:
-        for key, emoji in EMOJI_MAP.items():
-            if key in name or name in key:
-                return emoji
-    
-    # Default emojis based on level
-    if level == 'category':
-        return '📁'
-    elif level == 'subcategory':
-        return '📂'
-    elif level == 'subclass':
-        return '📄'
-    
-    return '📁'
+    return EMOJI_MATCHER.lookup(name, level)
 
 def parse_csv_with_multiline(csv_file):
     """Parse CSV file preserving multi-line text fields"""
@@ -393,7 +402,7 @@ def convert_csv_to_json(csv_file):
                 subclass_obj = {
                     'id': subclass_data['id'],
                     'name': subclass_data['name'],
-                    'icon': subclass_data.get('icon', get_emoji_for_name(subclass_data['name'], 'subclass')),
+                    'icon': subclass_data['icon'],
                     'maxItems': subclass_data['maxItems'],
                     'items': subclass_data['items']
                 }
@@ -402,7 +411,7 @@ def convert_csv_to_json(csv_file):
             subcat_obj = {
                 'id': subcat_data['id'],
                 'name': subcat_data['name'],
-                'icon': subcat_data.get('icon', get_emoji_for_name(subcat_data['name'], 'subcategory')),
+                'icon': subcat_data['icon'],
                 'maxItems': subcat_data['maxItems'],
                 'items': subcat_data['items']
             }
@@ -466,16 +475,31 @@ def main():
         # 转换 CSV 到 JSON
         result, item_count, category_count = convert_csv_to_json(csv_file)
         
+        # 发布前完整性检查，有问题时不覆盖 data.json
+        _, violations = check_catalogue(result, OUTPUT_FILE)
+        if violations:
+            print()
+            print("=" * 50)
+            print(f"❌ 完整性检查失败，发现 {len(violations)} 个问题，未写入 {OUTPUT_FILE}")
+            print("=" * 50)
+            print_violations(violations)
+            print()
+            sys.exit(1)
+        
         # 写入 data.json
         output_path = Path(OUTPUT_FILE)
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(result, f, ensure_ascii=False, indent=2)
         
+        # 写入每日随机 / 收藏筛选使用的位置位图索引
+        with open(Path(FILTER_INDEX_FILE), 'w', encoding='utf-8') as f:
+            json.dump(build_filter_index(result), f, ensure_ascii=False, indent=2)
+        
         print()
         print("=" * 50)
         print("✅ 转换成功！")
         print("=" * 50)
-        print(f"📁 输出文件: {OUTPUT_FILE}")
+        print(f"📁 输出文件: {OUTPUT_FILE}, {FILTER_INDEX_FILE}")
         print(f"📊 总项目数: {item_count}")
         print(f"📂 总分类数: {category_count}")
         print()